@@ -15,11 +15,13 @@ from src.api.schemas.tasks import (
     TaskTemplateResponse,
     TaskInstanceResponse,
     TaskCompleteRequest,
+    TaskBatchCompleteRequest,
     TaskSkipRequest,
     TaskStatusUpdateRequest,
     ComplianceMetricsResponse,
     BlockingTasksStatusResponse,
     CycleReadinessStatusResponse,
+    TaskDashboardResponse,
     WeeklyComplianceResponse,
     TaskAuditLogResponse,
 )
@@ -31,6 +33,14 @@ router = APIRouter(prefix="/tasks", tags=["tasks"])
 task_service = TaskService()
 
 
+def get_task_user_id() -> str:
+    """User ID recorded against task actions and audit entries
+
+    TODO: Get actual user ID from auth once the task routes require it
+    """
+    return "system"
+
+
 @router.get("/", response_model=List[TaskInstanceResponse])
 async def get_pending_tasks(
     db: Session = Depends(get_db),
@@ -103,16 +113,32 @@ async def get_compliance_trends(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/complete-batch", response_model=List[TaskInstanceResponse])
+async def complete_tasks_batch(
+    request: TaskBatchCompleteRequest,
+    db: Session = Depends(get_db),
+    user_id: str = Depends(get_task_user_id),
+):
+    """Mark several tasks as complete in one request"""
+    try:
+        tasks = await task_service.complete_tasks(db, request.ids, user_id, request.notes)
+        return tasks
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Failed to complete tasks {request.ids}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/{task_id}/complete", response_model=TaskInstanceResponse)
 async def complete_task(
     task_id: int = Path(..., description="Task instance ID"),
     request: Optional[TaskCompleteRequest] = None,
     db: Session = Depends(get_db),
+    user_id: str = Depends(get_task_user_id),
 ):
     """Mark a task as complete"""
     try:
-        # TODO: Get actual user ID from auth
-        user_id = "system"
         task = await task_service.complete_task(
             db, task_id, user_id, request.notes if request else None
         )
@@ -129,11 +155,10 @@ async def skip_task(
     task_id: int = Path(..., description="Task instance ID"),
     request: Optional[TaskSkipRequest] = None,
     db: Session = Depends(get_db),
+    user_id: str = Depends(get_task_user_id),
 ):
     """Skip a task with a reason"""
     try:
-        # TODO: Get actual user ID from auth
-        user_id = "system"
         task = await task_service.skip_task(
             db, task_id, user_id, request.reason if request else "No reason provided"
         )
@@ -150,11 +175,10 @@ async def update_task_status(
     task_id: int = Path(..., description="Task instance ID"),
     request: Optional[TaskStatusUpdateRequest] = None,
     db: Session = Depends(get_db),
+    user_id: str = Depends(get_task_user_id),
 ):
     """Update task status"""
     try:
-        # TODO: Get actual user ID from auth
-        user_id = "system"
         task = await task_service.update_task_status(
             db, task_id, request.status if request else "pending", user_id
         )
@@ -267,6 +291,20 @@ async def get_weekly_readiness(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/dashboard", response_model=TaskDashboardResponse)
+async def get_task_dashboard(
+    db: Session = Depends(get_db),
+    check_date: Optional[date] = Query(None, description="Date to check (defaults to today)"),
+):
+    """Get pending tasks with blocking status and weekly readiness in one call"""
+    try:
+        dashboard = await task_service.get_task_dashboard(db, check_date)
+        return dashboard
+    except Exception as e:
+        logger.error(f"Failed to get task dashboard: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/generate")
 async def generate_task_instances(
     db: Session = Depends(get_db),
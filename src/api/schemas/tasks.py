@@ -112,6 +112,13 @@ class TaskCompleteRequest(BaseModel):
     notes: Optional[str] = Field(None, max_length=1000, description="Completion notes")
 
 
+class TaskBatchCompleteRequest(BaseModel):
+    """Request to complete several tasks at once"""
+
+    ids: List[int] = Field(..., min_length=1, description="Task instance IDs")
+    notes: Optional[str] = Field(None, max_length=1000, description="Completion notes")
+
+
 class TaskSkipRequest(BaseModel):
     """Request to skip a task"""
 
@@ -165,6 +172,17 @@ class CycleReadinessStatusResponse(BaseModel):
         from_attributes = True
 
 
+class TaskDashboardResponse(BaseModel):
+    """Response schema for pending tasks with weekly blocking status"""
+
+    tasks: List[TaskInstanceResponse]
+    blocking_status: BlockingTasksStatusResponse
+    readiness: CycleReadinessStatusResponse
+
+    class Config:
+        from_attributes = True
+
+
 class WeeklyComplianceResponse(BaseModel):
     """Response schema for weekly compliance trends"""
 
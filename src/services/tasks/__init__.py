@@ -1,6 +1,6 @@
 """Task management services"""
 
-from .task_service import TaskService, ComplianceMetrics
+from .task_service import TaskService, ComplianceMetrics, TaskDashboard
 from .rrule_parser import RRuleParser, ValidationResult
 from .compliance_checker import (
     ComplianceChecker,
@@ -12,6 +12,7 @@ from .compliance_checker import (
 __all__ = [
     "TaskService",
     "ComplianceMetrics",
+    "TaskDashboard",
     "RRuleParser",
     "ValidationResult",
     "ComplianceChecker",
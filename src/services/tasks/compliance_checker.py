@@ -2,7 +2,7 @@
 
 import logging
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from pydantic import BaseModel
@@ -45,50 +45,30 @@ class ComplianceChecker:
     """Handles compliance checking and blocking logic"""
 
     async def check_weekly_cycle_ready(
-        self, db: Session, check_date: Optional[date] = None
+        self,
+        db: Session,
+        check_date: Optional[date] = None,
+        blocking_tasks: Optional[List[TaskInstance]] = None,
     ) -> CycleReadinessStatus:
         """Check if weekly cycle is ready to close
 
         Args:
             db: Database session
             check_date: Date to check (defaults to today)
+            blocking_tasks: Prefetched blocking tasks for the week; queried when omitted
 
         Returns:
             CycleReadinessStatus with readiness status and blocking tasks
         """
-        if check_date is None:
-            check_date = date.today()
-
-        # Get the week's date range (Monday to Sunday)
-        week_start = check_date - timedelta(days=check_date.weekday())
-        week_end = week_start + timedelta(days=6)
-
-        # Get all blocking tasks for the week
-        blocking_tasks = (
-            db.query(TaskInstance)
-            .filter(
-                and_(
-                    TaskInstance.is_blocking == True,
-                    TaskInstance.due_date >= datetime.combine(week_start, datetime.min.time()),
-                    TaskInstance.due_date <= datetime.combine(week_end, datetime.max.time()),
-                )
-            )
-            .all()
-        )
+        if blocking_tasks is None:
+            blocking_tasks = await self.get_blocking_tasks(db, check_date)
 
         # Check which are incomplete
-        incomplete_tasks = []
-        for task in blocking_tasks:
-            if task.status not in ["completed", "skipped"]:
-                incomplete_tasks.append(
-                    {
-                        "id": task.id,
-                        "name": task.name,
-                        "due_date": task.due_date.isoformat(),
-                        "status": task.status,
-                        "priority": task.priority,
-                    }
-                )
+        incomplete_tasks = [
+            self._task_summary(task)
+            for task in blocking_tasks
+            if task.status not in ["completed", "skipped"]
+        ]
 
         is_ready = len(incomplete_tasks) == 0
 
@@ -115,38 +95,58 @@ class ComplianceChecker:
         Returns:
             List of blocking TaskInstance objects
         """
-        if check_date is None:
-            check_date = date.today()
-
-        # Get the week's date range
-        week_start = check_date - timedelta(days=check_date.weekday())
-        week_end = week_start + timedelta(days=6)
+        week_start, week_end = self.get_week_range(check_date)
 
         return (
             db.query(TaskInstance)
             .filter(
                 and_(
                     TaskInstance.is_blocking == True,
-                    TaskInstance.due_date >= datetime.combine(week_start, datetime.min.time()),
-                    TaskInstance.due_date <= datetime.combine(week_end, datetime.max.time()),
+                    TaskInstance.due_date >= week_start,
+                    TaskInstance.due_date <= week_end,
                 )
             )
             .all()
         )
 
+    def get_week_range(self, check_date: Optional[date] = None) -> Tuple[datetime, datetime]:
+        """Get the Monday-to-Sunday datetime range containing a date
+
+        Args:
+            check_date: Date to check (defaults to today)
+
+        Returns:
+            Tuple of (start of Monday, end of Sunday)
+        """
+        if check_date is None:
+            check_date = date.today()
+
+        week_start = check_date - timedelta(days=check_date.weekday())
+        week_end = week_start + timedelta(days=6)
+
+        return (
+            datetime.combine(week_start, datetime.min.time()),
+            datetime.combine(week_end, datetime.max.time()),
+        )
+
     async def check_blocking_tasks_complete(
-        self, db: Session, check_date: Optional[date] = None
+        self,
+        db: Session,
+        check_date: Optional[date] = None,
+        blocking_tasks: Optional[List[TaskInstance]] = None,
     ) -> BlockingTasksStatus:
         """Check if all blocking tasks are complete for a date
 
         Args:
             db: Database session
             check_date: Date to check (defaults to today)
+            blocking_tasks: Prefetched blocking tasks for the week; queried when omitted
 
         Returns:
             BlockingTasksStatus with completion status
         """
-        blocking_tasks = await self.get_blocking_tasks(db, check_date)
+        if blocking_tasks is None:
+            blocking_tasks = await self.get_blocking_tasks(db, check_date)
 
         incomplete_tasks = []
         completed_count = 0
@@ -155,15 +155,7 @@ class ComplianceChecker:
             if task.status in ["completed", "skipped"]:
                 completed_count += 1
             else:
-                incomplete_tasks.append(
-                    {
-                        "id": task.id,
-                        "name": task.name,
-                        "due_date": task.due_date.isoformat(),
-                        "status": task.status,
-                        "priority": task.priority,
-                    }
-                )
+                incomplete_tasks.append(self._task_summary(task))
 
         return BlockingTasksStatus(
             all_complete=len(incomplete_tasks) == 0,
@@ -260,3 +252,13 @@ class ComplianceChecker:
             )
 
         return trends
+
+    def _task_summary(self, task: TaskInstance) -> Dict[str, Any]:
+        """Summarize an incomplete blocking task for status responses"""
+        return {
+            "id": task.id,
+            "name": task.name,
+            "due_date": task.due_date.isoformat(),
+            "status": task.status,
+            "priority": task.priority,
+        }
@@ -2,7 +2,8 @@
 
 import logging
 from datetime import datetime, date
-from typing import List, Optional, Dict, Any, Union
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Tuple, Union
 from dateutil.rrule import rrule, rruleset, rrulestr, DAILY, WEEKLY, MONTHLY
 from dateutil.parser import parse as date_parse
 from pydantic import BaseModel, ValidationError
@@ -18,6 +19,30 @@ class ValidationResult(BaseModel):
     parsed_rule: Optional[Dict[str, Any]] = None
 
 
+@lru_cache(maxsize=512)
+def _parse_cached(rrule_string: str, dtstart: datetime) -> Union[rrule, rruleset]:
+    """Parse an RRULE string, memoized by string and start date
+
+    The "RRULE:" prefix is added here rather than by the caller so cache hits
+    never build the prefixed string.
+    """
+    if not rrule_string.startswith("RRULE:"):
+        rrule_string = f"RRULE:{rrule_string}"
+    return rrulestr(rrule_string, dtstart=dtstart)
+
+
+@lru_cache(maxsize=256)
+def _generate_cached(rrule_string: str, start_date: date, end_date: date) -> Tuple[datetime, ...]:
+    """Expand an RRULE within a date range, memoized by rule and range"""
+    # Convert dates to datetime
+    start_dt = datetime.combine(start_date, datetime.min.time())
+    end_dt = datetime.combine(end_date, datetime.max.time())
+
+    # Parse the rule and generate occurrences
+    rule = _parse_cached(rrule_string, start_dt)
+    return tuple(rule.between(start_dt, end_dt, inc=True))
+
+
 class RRuleParser:
     """Handles RRULE parsing and task generation"""
 
@@ -40,13 +65,10 @@ class RRuleParser:
             ValueError: If the RRULE string is invalid
         """
         try:
-            if not rrule_string.startswith("RRULE:"):
-                rrule_string = f"RRULE:{rrule_string}"
-
             if dtstart is None:
                 dtstart = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
-            return rrulestr(rrule_string, dtstart=dtstart)
+            return _parse_cached(rrule_string, dtstart)
         except Exception as e:
             logger.error(f"Failed to parse RRULE '{rrule_string}': {e}")
             raise ValueError(f"Invalid RRULE format: {str(e)}")
@@ -54,6 +76,9 @@ class RRuleParser:
     def validate_rrule(self, rrule_string: str) -> ValidationResult:
         """Validate an RRULE string
 
+        Parsing is memoized; the occurrence check runs on every call because
+        it depends on the current time.
+
         Args:
             rrule_string: RRULE string to validate
 
@@ -112,15 +137,7 @@ class RRuleParser:
             List of datetime occurrences
         """
         try:
-            # Convert dates to datetime
-            start_dt = datetime.combine(start_date, datetime.min.time())
-            end_dt = datetime.combine(end_date, datetime.max.time())
-
-            # Parse the rule
-            rule = self.parse_rrule(rrule_string, dtstart=start_dt)
-
-            # Generate occurrences
-            occurrences = list(rule.between(start_dt, end_dt, inc=True))
+            occurrences = list(_generate_cached(rrule_string, start_date, end_date))
 
             logger.debug(
                 f"Generated {len(occurrences)} occurrences for rule '{rrule_string}' between {start_date} and {end_date}"
@@ -4,7 +4,7 @@ import logging
 from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, case, func, insert, update
 
 from src.db.models import TaskTemplate, TaskInstance, TaskAuditLog
 from .rrule_parser import RRuleParser
@@ -12,6 +12,10 @@ from .compliance_checker import ComplianceChecker, BlockingTasksStatus, CycleRea
 
 logger = logging.getLogger(__name__)
 
+# RRuleParser holds no per-instance state (its caches are module-level), so
+# every TaskService shares this one instead of building its own
+_default_rrule_parser = RRuleParser()
+
 
 class ComplianceMetrics:
     """Compliance metrics for a date range"""
@@ -41,11 +45,25 @@ class ComplianceMetrics:
         self.blocking_tasks_complete = blocking_tasks_complete
 
 
+class TaskDashboard:
+    """Pending tasks together with the week's blocking status and readiness"""
+
+    def __init__(
+        self,
+        tasks: List[TaskInstance],
+        blocking_status: BlockingTasksStatus,
+        readiness: CycleReadinessStatus,
+    ):
+        self.tasks = tasks
+        self.blocking_status = blocking_status
+        self.readiness = readiness
+
+
 class TaskService:
     """Core service for task management operations"""
 
     def __init__(self):
-        self.rrule_parser = RRuleParser()
+        self.rrule_parser = _default_rrule_parser
         self.compliance_checker = ComplianceChecker()
 
     async def create_task_template(
@@ -182,8 +200,23 @@ class TaskService:
         """
         # Get active templates
         templates = await self.get_task_templates(db, active_only=True)
-        created_instances = []
+        created_instances: List[TaskInstance] = []
+
+        # Look up every instance already in the range in one query, rather
+        # than checking each occurrence separately
+        existing = set(
+            db.query(TaskInstance.template_id, TaskInstance.due_date)
+            .filter(
+                and_(
+                    TaskInstance.template_id.in_([template.id for template in templates]),
+                    TaskInstance.due_date >= datetime.combine(start_date, datetime.min.time()),
+                    TaskInstance.due_date <= datetime.combine(end_date, datetime.max.time()),
+                )
+            )
+            .all()
+        )
 
+        new_instances = []
         for template in templates:
             # Generate occurrences for this template
             occurrences = self.rrule_parser.generate_occurrences(
@@ -191,31 +224,29 @@ class TaskService:
             )
 
             for occurrence in occurrences:
-                # Check if instance already exists
-                existing = (
-                    db.query(TaskInstance)
-                    .filter(
-                        and_(
-                            TaskInstance.template_id == template.id,
-                            TaskInstance.due_date == occurrence,
-                        )
+                if (template.id, occurrence) not in existing:
+                    new_instances.append(
+                        {
+                            "template_id": template.id,
+                            "name": template.name,
+                            "description": template.description,
+                            "due_date": occurrence,
+                            "is_blocking": template.is_blocking,
+                            "priority": template.priority,
+                            "status": "pending",
+                        }
                     )
-                    .first()
-                )
 
-                if not existing:
-                    # Create new instance
-                    instance = TaskInstance(
-                        template_id=template.id,
-                        name=template.name,
-                        description=template.description,
-                        due_date=occurrence,
-                        is_blocking=template.is_blocking,
-                        priority=template.priority,
-                        status="pending",
-                    )
-                    db.add(instance)
-                    created_instances.append(instance)
+        # Create all new instances in one batched INSERT
+        if new_instances:
+            result = db.execute(insert(TaskInstance).returning(TaskInstance), new_instances)
+
+            # Batched RETURNING rows are not guaranteed to come back in input
+            # order, so put them back in generation order
+            created = {(task.template_id, task.due_date): task for task in result.scalars()}
+            created_instances = [
+                created[(row["template_id"], row["due_date"])] for row in new_instances
+            ]
 
         db.commit()
 
@@ -312,6 +343,68 @@ class TaskService:
         logger.info(f"Task completed: {task.name} (ID: {task_id}) by {user_id}")
         return task
 
+    async def complete_tasks(
+        self, db: Session, task_ids: List[int], user_id: str, notes: Optional[str] = None
+    ) -> List[TaskInstance]:
+        """Mark several tasks as complete in one batch
+
+        Issues a single UPDATE for all tasks and a single INSERT for their
+        audit log entries instead of one round-trip per task.
+
+        Args:
+            db: Database session
+            task_ids: Task instance IDs
+            user_id: User completing the tasks
+            notes: Optional completion notes applied to every task
+
+        Returns:
+            List of updated TaskInstance objects
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        old_statuses = dict(
+            db.query(TaskInstance.id, TaskInstance.status)
+            .filter(TaskInstance.id.in_(task_ids))
+            .all()
+        )
+        missing = [task_id for task_id in task_ids if task_id not in old_statuses]
+        if missing:
+            raise ValueError(f"Tasks {missing} not found")
+
+        values: Dict[str, Any] = {
+            "status": "completed",
+            "completed_at": datetime.now(),
+            "completed_by": user_id,
+        }
+        if notes:
+            values["notes"] = notes
+
+        db.execute(update(TaskInstance).where(TaskInstance.id.in_(task_ids)).values(**values))
+        db.execute(
+            insert(TaskAuditLog),
+            [
+                {
+                    "task_instance_id": task_id,
+                    "action": "completed",
+                    "old_status": old_statuses[task_id],
+                    "new_status": "completed",
+                    "user_id": user_id,
+                    "notes": notes,
+                }
+                for task_id in task_ids
+            ],
+        )
+        db.commit()
+
+        tasks = (
+            db.query(TaskInstance)
+            .filter(TaskInstance.id.in_(task_ids))
+            .order_by(TaskInstance.due_date, TaskInstance.priority)
+            .all()
+        )
+
+        logger.info(f"Tasks completed: {len(tasks)} tasks by {user_id}")
+        return tasks
+
     async def skip_task(self, db: Session, task_id: int, user_id: str, reason: str) -> TaskInstance:
         """Skip a task
 
@@ -401,45 +494,53 @@ class TaskService:
         Returns:
             ComplianceMetrics object
         """
-        # Get all tasks in range
-        tasks = (
-            db.query(TaskInstance)
+        done = TaskInstance.status.in_(["completed", "skipped"])
+        daily = TaskInstance.is_blocking == False
+        weekly = TaskInstance.is_blocking == True
+        overdue = and_(
+            TaskInstance.status.in_(["pending", "in_progress"]),
+            TaskInstance.due_date < datetime.now(),
+        )
+
+        # Tally every metric in a single aggregate query over the range
+        counts = (
+            db.query(
+                func.count(TaskInstance.id).label("total"),
+                func.sum(case((TaskInstance.status == "completed", 1), else_=0)).label("completed"),
+                func.sum(case((TaskInstance.status == "skipped", 1), else_=0)).label("skipped"),
+                func.sum(case((overdue, 1), else_=0)).label("overdue"),
+                func.sum(case((daily, 1), else_=0)).label("daily"),
+                func.sum(case((and_(daily, done), 1), else_=0)).label("daily_done"),
+                func.sum(case((weekly, 1), else_=0)).label("weekly"),
+                func.sum(case((and_(weekly, done), 1), else_=0)).label("weekly_done"),
+            )
             .filter(
                 and_(
                     TaskInstance.due_date >= datetime.combine(start_date, datetime.min.time()),
                     TaskInstance.due_date <= datetime.combine(end_date, datetime.max.time()),
                 )
             )
-            .all()
+            .one()
         )
 
-        # Calculate metrics
-        total_tasks = len(tasks)
-        completed_tasks = sum(1 for t in tasks if t.status == "completed")
-        skipped_tasks = sum(1 for t in tasks if t.status == "skipped")
-        overdue_tasks = sum(
-            1
-            for t in tasks
-            if t.status in ["pending", "in_progress"] and t.due_date < datetime.now()
-        )
+        # SUM over no rows is NULL
+        total_tasks = counts.total or 0
+        completed_tasks = counts.completed or 0
+        skipped_tasks = counts.skipped or 0
+        overdue_tasks = counts.overdue or 0
 
         compliance_rate = 0.0
         if total_tasks > 0:
             compliance_rate = ((completed_tasks + skipped_tasks) / total_tasks) * 100
 
         # Calculate daily vs weekly compliance
-        daily_tasks = [t for t in tasks if t.is_blocking == False]
-        weekly_tasks = [t for t in tasks if t.is_blocking == True]
-
         daily_compliance_rate = 0.0
-        if daily_tasks:
-            daily_completed = sum(1 for t in daily_tasks if t.status in ["completed", "skipped"])
-            daily_compliance_rate = (daily_completed / len(daily_tasks)) * 100
+        if counts.daily:
+            daily_compliance_rate = (counts.daily_done / counts.daily) * 100
 
         weekly_compliance_rate = 0.0
-        if weekly_tasks:
-            weekly_completed = sum(1 for t in weekly_tasks if t.status in ["completed", "skipped"])
-            weekly_compliance_rate = (weekly_completed / len(weekly_tasks)) * 100
+        if counts.weekly:
+            weekly_compliance_rate = (counts.weekly_done / counts.weekly) * 100
 
         # Check blocking tasks
         blocking_status = await self.compliance_checker.check_blocking_tasks_complete(db, end_date)
@@ -470,3 +571,50 @@ class TaskService:
             BlockingTasksStatus
         """
         return await self.compliance_checker.check_blocking_tasks_complete(db, check_date)
+
+    async def get_task_dashboard(
+        self, db: Session, check_date: Optional[date] = None
+    ) -> TaskDashboard:
+        """Get pending tasks, blocking status and weekly readiness from one query
+
+        Args:
+            db: Database session
+            check_date: Date whose week is checked (defaults to today)
+
+        Returns:
+            TaskDashboard
+        """
+        week_start, week_end = self.compliance_checker.get_week_range(check_date)
+        active_statuses = ["pending", "in_progress"]
+
+        tasks = (
+            db.query(TaskInstance)
+            .filter(
+                or_(
+                    TaskInstance.status.in_(active_statuses),
+                    and_(
+                        TaskInstance.is_blocking == True,
+                        TaskInstance.due_date >= week_start,
+                        TaskInstance.due_date <= week_end,
+                    ),
+                )
+            )
+            .order_by(TaskInstance.due_date, TaskInstance.priority)
+            .all()
+        )
+
+        pending_tasks = [t for t in tasks if t.status in active_statuses]
+        blocking_tasks = [
+            t for t in tasks if t.is_blocking and week_start <= t.due_date <= week_end
+        ]
+
+        blocking_status = await self.compliance_checker.check_blocking_tasks_complete(
+            db, check_date, blocking_tasks=blocking_tasks
+        )
+        readiness = await self.compliance_checker.check_weekly_cycle_ready(
+            db, check_date, blocking_tasks=blocking_tasks
+        )
+
+        return TaskDashboard(
+            tasks=pending_tasks, blocking_status=blocking_status, readiness=readiness
+        )
@@ -2,12 +2,14 @@
 
 import pytest
 import asyncio
-import tempfile
+import gc
 import os
 import uuid
+from contextlib import contextmanager
 from typing import Generator
 from unittest.mock import patch
-from sqlalchemy import create_engine
+from _pytest import timing
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -34,6 +36,92 @@ def generate_unique_user_id() -> str:
 # Let pytest-asyncio manage the event loop via asyncio_mode=auto in pytest.ini
 
 
+# Tests whose recorded call time is above this are marked ``slow``, so
+# ``pytest -m "not slow"`` gives a quick local loop while CI runs everything
+SLOW_TEST_SECONDS = 0.1
+_DURATIONS_CACHE_KEY = "aims/durations"
+_durations: dict[str, float] = {}
+
+# Garbage collection pauses land on whichever test trips the collector, so
+# they are timed separately and left out of each test's duration
+_gc_pause = {"started": 0.0, "total": 0.0}
+_gc_call_seconds = pytest.StashKey[float]()
+
+
+def _time_gc_pause(phase, info):
+    """Accumulate time spent in garbage collection"""
+    # _pytest.timing is exempt from the task tests' frozen clock
+    if phase == "start":
+        _gc_pause["started"] = timing.perf_counter()
+    else:
+        _gc_pause["total"] += timing.perf_counter() - _gc_pause["started"]
+
+
+gc.callbacks.append(_time_gc_pause)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark tests that were slow on their recorded runs"""
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return
+
+    durations = cache.get(_DURATIONS_CACHE_KEY, {})
+    for item in items:
+        if durations.get(item.nodeid, 0.0) > SLOW_TEST_SECONDS:
+            item.add_marker(pytest.mark.slow)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Note how much of the test call was spent in garbage collection"""
+    gc_before = _gc_pause["total"]
+    try:
+        return (yield)
+    finally:
+        item.stash[_gc_call_seconds] = _gc_pause["total"] - gc_before
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Attach the call's GC time to its report so it survives pytest-xdist"""
+    report = yield
+    if call.when == "call":
+        report.gc_seconds = item.stash.get(_gc_call_seconds, 0.0)
+    return report
+
+
+def pytest_runtest_logreport(report):
+    """Record each test's call time, less garbage collection pauses
+
+    Setup and teardown are left out: they carry one-off package- and
+    session-scoped fixture work that lands on whichever test runs first.
+    """
+    if report.when == "call":
+        gc_seconds = getattr(report, "gc_seconds", 0.0)
+        _durations[report.nodeid] = max(report.duration - gc_seconds, 0.0)
+
+
+def pytest_sessionfinish(session):
+    """Merge this run's durations into the stored ones
+
+    Only tests that ran are updated, so a partial or ``-m "not slow"`` run
+    keeps every other test's timing. Each stored value is the average of
+    the previous value and the new one, so a test near the threshold is not
+    flipped by a single noisy run. Only the controller writes; under
+    pytest-xdist the worker reports are forwarded to it.
+    """
+    cache = getattr(session.config, "cache", None)
+    if cache is None or os.environ.get("PYTEST_XDIST_WORKER") or not _durations:
+        return
+
+    durations = cache.get(_DURATIONS_CACHE_KEY, {})
+    for nodeid, seconds in _durations.items():
+        previous = durations.get(nodeid)
+        durations[nodeid] = seconds if previous is None else (previous + seconds) / 2
+    cache.set(_DURATIONS_CACHE_KEY, durations)
+
+
 @pytest.fixture
 def anyio_backend():
     """Backend for anyio async testing"""
@@ -43,12 +131,19 @@ def anyio_backend():
 @pytest.fixture(scope="session")
 def test_db_engine():
     """Create a test database engine"""
-    # Create a temporary database file
-    db_fd, db_path = tempfile.mkstemp(suffix=".db")
-    os.close(db_fd)  # Close the file descriptor, we just need the path
+    # Named shared-cache in-memory database. Under pytest-xdist each worker is
+    # its own process with its own session, so every worker gets a separate
+    # database and runs the DDL below exactly once against it.
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    test_database_url = (
+        f"sqlite+pysqlite:///file:aims_test_{worker_id}?mode=memory&cache=shared&uri=true"
+    )
 
-    # Create engine for test database
-    test_database_url = f"sqlite:///{db_path}"
+    # Create engine for test database. StaticPool hands out one shared
+    # connection, so there is no pool to size: every request in a test
+    # reuses the single test_db_session bound to that connection, which is
+    # why tests must not issue overlapping requests. It also keeps the
+    # in-memory database alive until the engine is disposed.
     engine = create_engine(
         test_database_url,
         connect_args={"check_same_thread": False},
@@ -56,28 +151,58 @@ def test_db_engine():
         echo=False,
     )
 
-    # Create all tables
-    Base.metadata.create_all(bind=engine)
+    # pysqlite emits its own BEGIN/COMMIT around DML, which breaks SAVEPOINT.
+    # Turn that off and emit BEGIN ourselves so test_db_session can nest.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # Test data is throwaway: skip syncs and keep journals and temp tables in RAM
+    @event.listens_for(engine, "connect")
+    def _set_test_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    # Create all tables once per session. The database is always new, so
+    # skip the per-table existence checks create_all would otherwise run.
+    Base.metadata.create_all(bind=engine, checkfirst=False)
 
     yield engine
 
-    # Cleanup: close engine and remove temp file
+    # Cleanup: closing the last connection drops the in-memory database
     engine.dispose()
-    try:
-        os.unlink(db_path)
-    except OSError:
-        pass
 
 
 @pytest.fixture(scope="session")
 def test_session_factory(test_db_engine):
-    """Create a session factory for tests"""
-    return sessionmaker(autocommit=False, autoflush=False, bind=test_db_engine)
+    """Create a session factory for tests
+
+    Sessions join the caller's transaction through a SAVEPOINT, so commit()
+    and rollback() inside code under test never end the outer transaction.
+    """
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=test_db_engine,
+        join_transaction_mode="create_savepoint",
+    )
 
 
 @pytest.fixture
 def test_db_session(test_session_factory, test_db_engine) -> Generator[Session, None, None]:
-    """Create a database session for a test with proper isolation using transactions"""
+    """Create a database session for a test with proper isolation using transactions
+
+    The schema is created once per session; each test runs inside an outer
+    transaction that is rolled back afterwards, with the session's own
+    commits and rollbacks confined to SAVEPOINTs within it.
+    """
     connection = test_db_engine.connect()
     transaction = connection.begin()
     session = test_session_factory(bind=connection)
@@ -90,6 +215,43 @@ def test_db_session(test_session_factory, test_db_engine) -> Generator[Session,
         connection.close()
 
 
+_TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@pytest.fixture
+def count_queries(test_db_engine):
+    """Guard a block against issuing more than ``max_queries`` SQL statements
+
+    Usage::
+
+        with count_queries(max_queries=2):
+            client.get("/api/tasks/")
+    """
+
+    @contextmanager
+    def _count_queries(max_queries: int):
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            # SAVEPOINT bookkeeping from test_db_session is not application work
+            if not statement.startswith(_TRANSACTION_CONTROL):
+                statements.append(statement)
+
+        event.listen(test_db_engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(test_db_engine, "before_cursor_execute", _record)
+
+        assert (
+            len(statements) <= max_queries
+        ), f"Expected at most {max_queries} SQL statements, got {len(statements)}:\n" + "\n".join(
+            statements
+        )
+
+    return _count_queries
+
+
 @pytest.fixture
 def override_get_db(test_db_session):
     """Override the get_db dependency for FastAPI tests"""
@@ -110,23 +272,50 @@ def mock_rate_limiters():
         yield
 
 
+@pytest.fixture(scope="session")
+def shared_test_client():
+    """Create one TestClient for the whole session
+
+    The app itself is stateless between tests; per-test state lives in the
+    dependency overrides installed by the ``client`` fixtures. The client is
+    not entered as a context manager so the app lifespan (real DB init and
+    scheduler start) never runs under test.
+    """
+    from fastapi.testclient import TestClient
+    from src.api.main import app
+
+    return TestClient(app)
+
+
 @pytest.fixture
-def client(override_get_db, mock_rate_limiters):
+def client(shared_test_client, override_get_db, mock_rate_limiters):
     """Create test client with database override and mocked rate limiters"""
-    from fastapi.testclient import TestClient
     from src.api.main import app
     from src.db.session import get_db
 
     app.dependency_overrides[get_db] = override_get_db
-    client = TestClient(app)
-    yield client
+    shared_test_client.cookies.clear()
+    yield shared_test_client
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def no_auth_client(override_get_db, mock_rate_limiters):
+async def async_client(override_get_db, mock_rate_limiters):
+    """Create an async client that calls the ASGI app directly in the test's event loop"""
+    import httpx
+    from src.api.main import app
+    from src.db.session import get_db
+
+    app.dependency_overrides[get_db] = override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def no_auth_client(shared_test_client, override_get_db, mock_rate_limiters):
     """Create a client without auth override to test unauthorized cases"""
-    from fastapi.testclient import TestClient
     from src.api.main import app
     from src.db.session import get_db
     from src.api.auth import get_current_user
@@ -134,6 +323,6 @@ def no_auth_client(override_get_db, mock_rate_limiters):
     app.dependency_overrides[get_db] = override_get_db
     # Remove any auth override so endpoints require Authorization header
     app.dependency_overrides.pop(get_current_user, None)
-    client = TestClient(app)
-    yield client
+    shared_test_client.cookies.clear()
+    yield shared_test_client
     app.dependency_overrides.clear()
@@ -18,6 +18,7 @@ Requirements:
 - Test database setup
 """
 
+import os
 import pytest
 import asyncio
 import time
@@ -43,8 +44,10 @@ skip_if_no_snaptrade_credentials = pytest.mark.skipif(
 )
 
 
-# Test Database Setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test_snaptrade_integration.db"
+# Test Database Setup (one file per pytest-xdist worker)
+SQLALCHEMY_DATABASE_URL = (
+    f"sqlite:///./test_snaptrade_integration_{os.environ.get('PYTEST_XDIST_WORKER', 'master')}.db"
+)
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
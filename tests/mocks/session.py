@@ -0,0 +1,58 @@
+"""Mock database session for testing"""
+
+from typing import Any, List
+
+
+class MockQuery:
+    """Query chain that hands back the owning session's canned results"""
+
+    def __init__(self, session: "MockSession"):
+        self.session = session
+
+    def filter(self, *criteria: Any) -> "MockQuery":
+        return self
+
+    def order_by(self, *clauses: Any) -> "MockQuery":
+        return self
+
+    def all(self) -> List[Any]:
+        return self.session.next_result()
+
+    def first(self) -> Any:
+        results = self.all()
+        return results[0] if results else None
+
+
+class MockSession:
+    """Minimal stand-in for a SQLAlchemy Session
+
+    Covers the small surface the task services use: query(...) chained with
+    filter/order_by and ending in all() or first(), plus add/commit/refresh.
+    """
+
+    def __init__(self):
+        self.query_calls: List[tuple] = []
+        self.added: List[Any] = []
+        self._results: List[List[Any]] = [[]]
+
+    def set_query_results(self, *results: List[Any]) -> None:
+        """Return each result from successive queries; the last one repeats"""
+        self._results = list(results)
+
+    def next_result(self) -> List[Any]:
+        if len(self._results) > 1:
+            return self._results.pop(0)
+        return self._results[0]
+
+    def query(self, *entities: Any) -> MockQuery:
+        self.query_calls.append(entities)
+        return MockQuery(self)
+
+    def add(self, instance: Any) -> None:
+        self.added.append(instance)
+
+    def commit(self) -> None:
+        pass
+
+    def refresh(self, instance: Any) -> None:
+        pass
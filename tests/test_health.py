@@ -1,14 +1,12 @@
 """Tests for health check endpoints"""
 
 import pytest
-from fastapi.testclient import TestClient
-from src.api.main import app
 
 
-@pytest.fixture
-def client():
-    """Create test client"""
-    return TestClient(app)
+@pytest.fixture(scope="module")
+def client(shared_test_client):
+    """Reuse the session-wide test client; health checks need no overrides"""
+    return shared_test_client
 
 
 def test_root_endpoint(client):
@@ -6,10 +6,36 @@ from typing import Generator
 import sys
 import os
 
+from freezegun import freeze_time
+
+from src.services.tasks.task_service import TaskService
+
 # Add src to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 
+# Task tests run against a fixed Wednesday morning so due dates, overdue
+# checks and the Monday-Sunday week window are deterministic.
+FROZEN_NOW = "2025-07-16 09:00:00"
+
+
+@pytest.fixture(scope="package", autouse=True)
+def frozen_now():
+    """Freeze the clock at FROZEN_NOW for every task test
+
+    Package-scoped because starting freezegun patches every loaded module,
+    which is too slow to repeat per test.
+    """
+    with freeze_time(FROZEN_NOW, real_asyncio=True, ignore=["_pytest"]) as frozen:
+        yield frozen
+
+
+@pytest.fixture(scope="session")
+def task_service():
+    """One TaskService for the session; it holds no per-test state"""
+    return TaskService()
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an event loop for async tests"""
@@ -2,12 +2,15 @@
 
 import pytest
 import asyncio
-from datetime import date, datetime, timedelta
-from unittest.mock import Mock, MagicMock, AsyncMock
-from sqlalchemy.orm import Session
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, AsyncMock
 
 from src.services.tasks.compliance_checker import ComplianceChecker
-from src.db.models import TaskInstance
+from tests.mocks.session import MockSession
+
+# Matches the frozen clock (see conftest.py)
+FIXED_NOW = datetime(2025, 7, 16, 9, 0)
 
 
 class TestComplianceChecker:
@@ -16,7 +19,7 @@ class TestComplianceChecker:
     def setup_method(self):
         """Set up test fixtures"""
         self.checker = ComplianceChecker()
-        self.mock_db = Mock(spec=Session)
+        self.mock_db = MockSession()
 
     @pytest.mark.asyncio
     async def test_check_weekly_cycle_ready_all_complete(self):
@@ -27,7 +30,7 @@ class TestComplianceChecker:
             self._create_mock_task(2, "Task 2", True, "completed"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         result = await self.checker.check_weekly_cycle_ready(self.mock_db)
 
@@ -45,7 +48,7 @@ class TestComplianceChecker:
             self._create_mock_task(3, "Task 3", True, "in_progress"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         result = await self.checker.check_weekly_cycle_ready(self.mock_db)
 
@@ -55,6 +58,22 @@ class TestComplianceChecker:
         assert result.blocking_tasks[1]["name"] == "Task 3"
         assert "Cannot close weekly cycle" in result.message
 
+    @pytest.mark.asyncio
+    async def test_check_weekly_cycle_ready_uses_prefetched_tasks(self):
+        """Test that prefetched blocking tasks skip the database query"""
+        mock_tasks = [
+            self._create_mock_task(1, "Task 1", True, "completed"),
+            self._create_mock_task(2, "Task 2", True, "pending"),
+        ]
+
+        result = await self.checker.check_weekly_cycle_ready(
+            self.mock_db, blocking_tasks=mock_tasks
+        )
+
+        assert result.is_ready is False
+        assert [task["id"] for task in result.blocking_tasks] == [2]
+        assert self.mock_db.query_calls == []
+
     @pytest.mark.asyncio
     async def test_get_blocking_tasks_for_week(self):
         """Test getting blocking tasks for a specific week"""
@@ -64,13 +83,13 @@ class TestComplianceChecker:
             self._create_mock_task(2, "Task 2", True, "completed"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         tasks = await self.checker.get_blocking_tasks(self.mock_db, check_date)
 
         assert len(tasks) == 2
         # Verify the query was called with correct date range (Monday to Sunday)
-        self.mock_db.query.assert_called_once()
+        assert len(self.mock_db.query_calls) == 1
 
     @pytest.mark.asyncio
     async def test_check_blocking_tasks_complete_all_done(self):
@@ -117,7 +136,7 @@ class TestComplianceChecker:
             self._create_mock_task(3, "Task 3", False, "skipped"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         rate = await self.checker.calculate_compliance_rate(
             self.mock_db, date(2025, 7, 14), date(2025, 7, 20)
@@ -135,7 +154,7 @@ class TestComplianceChecker:
             self._create_mock_task(4, "Task 4", False, "in_progress"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         rate = await self.checker.calculate_compliance_rate(
             self.mock_db, date(2025, 7, 14), date(2025, 7, 20)
@@ -146,7 +165,7 @@ class TestComplianceChecker:
     @pytest.mark.asyncio
     async def test_calculate_compliance_rate_no_tasks(self):
         """Test compliance rate when no tasks exist"""
-        self.mock_db.query.return_value.filter.return_value.all.return_value = []
+        self.mock_db.set_query_results([])
 
         rate = await self.checker.calculate_compliance_rate(
             self.mock_db, date(2025, 7, 14), date(2025, 7, 20)
@@ -168,10 +187,7 @@ class TestComplianceChecker:
         ]
 
         # Set up mock to return different tasks for different date ranges
-        self.mock_db.query.return_value.filter.return_value.all.side_effect = [
-            week1_tasks,
-            week2_tasks,
-        ]
+        self.mock_db.set_query_results(week1_tasks, week2_tasks)
 
         # Mock check_blocking_tasks_complete
         self.checker.check_blocking_tasks_complete = AsyncMock()
@@ -186,12 +202,12 @@ class TestComplianceChecker:
         assert trends[1].blocking_complete is True
 
     def _create_mock_task(self, task_id, name, is_blocking, status):
-        """Helper to create a mock TaskInstance"""
-        task = Mock(spec=TaskInstance)
-        task.id = task_id
-        task.name = name
-        task.is_blocking = is_blocking
-        task.status = status
-        task.due_date = datetime.now()
-        task.priority = 1
-        return task
+        """Helper to create a stand-in TaskInstance; the checker only reads attributes"""
+        return SimpleNamespace(
+            id=task_id,
+            name=name,
+            is_blocking=is_blocking,
+            status=status,
+            due_date=FIXED_NOW,
+            priority=1,
+        )
@@ -1,12 +1,15 @@
 """Unit tests for ComplianceChecker (async version)"""
 
 import pytest
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
+from types import SimpleNamespace
 from unittest.mock import Mock, AsyncMock
-from sqlalchemy.orm import Session
 
 from src.services.tasks.compliance_checker import ComplianceChecker
-from src.db.models import TaskInstance
+from tests.mocks.session import MockSession
+
+# Matches the frozen clock (see conftest.py)
+FIXED_NOW = datetime(2025, 7, 16, 9, 0)
 
 
 class TestComplianceCheckerAsync:
@@ -15,7 +18,7 @@ class TestComplianceCheckerAsync:
     def setup_method(self):
         """Set up test fixtures"""
         self.checker = ComplianceChecker()
-        self.mock_db = Mock(spec=Session)
+        self.mock_db = MockSession()
 
     @pytest.mark.asyncio
     async def test_check_weekly_cycle_ready_all_complete(self):
@@ -26,7 +29,7 @@ class TestComplianceCheckerAsync:
             self._create_mock_task(2, "Task 2", True, "completed"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         result = await self.checker.check_weekly_cycle_ready(self.mock_db)
 
@@ -44,7 +47,7 @@ class TestComplianceCheckerAsync:
             self._create_mock_task(3, "Task 3", True, "in_progress"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         result = await self.checker.check_weekly_cycle_ready(self.mock_db)
 
@@ -63,13 +66,13 @@ class TestComplianceCheckerAsync:
             self._create_mock_task(2, "Task 2", True, "completed"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         tasks = await self.checker.get_blocking_tasks(self.mock_db, check_date)
 
         assert len(tasks) == 2
         # Verify the query was called with correct date range (Monday to Sunday)
-        self.mock_db.query.assert_called_once()
+        assert len(self.mock_db.query_calls) == 1
 
     @pytest.mark.asyncio
     async def test_check_blocking_tasks_complete_all_done(self):
@@ -116,7 +119,7 @@ class TestComplianceCheckerAsync:
             self._create_mock_task(3, "Task 3", False, "skipped"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         rate = await self.checker.calculate_compliance_rate(
             self.mock_db, date(2025, 7, 14), date(2025, 7, 20)
@@ -134,7 +137,7 @@ class TestComplianceCheckerAsync:
             self._create_mock_task(4, "Task 4", False, "in_progress"),
         ]
 
-        self.mock_db.query.return_value.filter.return_value.all.return_value = mock_tasks
+        self.mock_db.set_query_results(mock_tasks)
 
         rate = await self.checker.calculate_compliance_rate(
             self.mock_db, date(2025, 7, 14), date(2025, 7, 20)
@@ -145,7 +148,7 @@ class TestComplianceCheckerAsync:
     @pytest.mark.asyncio
     async def test_calculate_compliance_rate_no_tasks(self):
         """Test compliance rate when no tasks exist"""
-        self.mock_db.query.return_value.filter.return_value.all.return_value = []
+        self.mock_db.set_query_results([])
 
         rate = await self.checker.calculate_compliance_rate(
             self.mock_db, date(2025, 7, 14), date(2025, 7, 20)
@@ -167,10 +170,7 @@ class TestComplianceCheckerAsync:
         ]
 
         # Set up mock to return different tasks for different date ranges
-        self.mock_db.query.return_value.filter.return_value.all.side_effect = [
-            week1_tasks,
-            week2_tasks,
-        ]
+        self.mock_db.set_query_results(week1_tasks, week2_tasks)
 
         # Mock check_blocking_tasks_complete as async
         mock_blocking_status = Mock()
@@ -186,12 +186,12 @@ class TestComplianceCheckerAsync:
         assert trends[1].blocking_complete is True
 
     def _create_mock_task(self, task_id, name, is_blocking, status):
-        """Helper to create a mock TaskInstance"""
-        task = Mock(spec=TaskInstance)
-        task.id = task_id
-        task.name = name
-        task.is_blocking = is_blocking
-        task.status = status
-        task.due_date = datetime.now()
-        task.priority = 1
-        return task
+        """Helper to create a stand-in TaskInstance; the checker only reads attributes"""
+        return SimpleNamespace(
+            id=task_id,
+            name=name,
+            is_blocking=is_blocking,
+            status=status,
+            due_date=FIXED_NOW,
+            priority=1,
+        )
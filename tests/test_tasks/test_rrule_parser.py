@@ -3,6 +3,7 @@
 import pytest
 from datetime import datetime, date, timedelta
 from dateutil.rrule import DAILY, WEEKLY, MONTHLY
+from freezegun import freeze_time
 
 from src.services.tasks.rrule_parser import RRuleParser, ValidationResult
 
@@ -10,9 +11,10 @@ from src.services.tasks.rrule_parser import RRuleParser, ValidationResult
 class TestRRuleParser:
     """Test cases for RRuleParser"""
 
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.parser = RRuleParser()
+    @classmethod
+    def setup_class(cls):
+        """Set up one parser for the class; it holds no per-test state"""
+        cls.parser = RRuleParser()
 
     def test_parse_valid_daily_rrule(self):
         """Test parsing a valid daily RRULE"""
@@ -74,6 +76,25 @@ class TestRRuleParser:
         assert result.error_message is not None
         assert "Invalid RRULE format" in result.error_message
 
+    def test_parse_rrule_is_memoized(self):
+        """Test that repeated parses of the same RRULE and start reuse the cached rule"""
+        rrule_string = "RRULE:FREQ=WEEKLY;BYDAY=FR;BYHOUR=14"
+        dtstart = datetime(2025, 7, 14)
+
+        rule = self.parser.parse_rrule(rrule_string, dtstart=dtstart)
+
+        assert self.parser.parse_rrule(rrule_string, dtstart=dtstart) is rule
+
+    def test_validate_rrule_tracks_time_of_day(self):
+        """Test that validation is rechecked once the rule's only occurrence has passed"""
+        rrule_string = "RRULE:FREQ=DAILY;COUNT=1;BYHOUR=8"
+
+        with freeze_time("2025-07-16 07:00:00"):
+            assert self.parser.validate_rrule(rrule_string).is_valid is True
+
+        # Back on the package clock at 09:00, after the 08:00 occurrence
+        assert self.parser.validate_rrule(rrule_string).is_valid is False
+
     def test_validate_rrule_with_no_occurrences(self):
         """Test validating RRULE that generates no occurrences"""
         # This RRULE would generate occurrences only on Feb 30th (which doesn't exist)
@@ -105,8 +126,7 @@ class TestRRuleParser:
 
         # Should get all Mondays in July 2025
         assert len(occurrences) == 4
-        for occ in occurrences:
-            assert occ.weekday() == 0  # Monday
+        assert {occ.weekday() for occ in occurrences} == {0}  # Monday
 
     def test_generate_occurrences_with_hour(self):
         """Test generating occurrences with specific hour"""
@@ -117,9 +137,19 @@ class TestRRuleParser:
         occurrences = self.parser.generate_occurrences(rrule_string, start_date, end_date)
 
         assert len(occurrences) == 2
-        for occ in occurrences:
-            assert occ.hour == 14
-            assert occ.minute == 30
+        assert {(occ.hour, occ.minute) for occ in occurrences} == {(14, 30)}
+
+    def test_generate_occurrences_cached_returns_fresh_list(self):
+        """Test that cached expansions are returned as independent lists"""
+        rrule_string = "RRULE:FREQ=DAILY"
+        start_date = date(2025, 7, 16)
+        end_date = date(2025, 7, 18)
+
+        first = self.parser.generate_occurrences(rrule_string, start_date, end_date)
+        first.clear()
+        second = self.parser.generate_occurrences(rrule_string, start_date, end_date)
+
+        assert len(second) == 3
 
     def test_generate_occurrences_empty_for_invalid_rrule(self):
         """Test that invalid RRULE returns empty list"""
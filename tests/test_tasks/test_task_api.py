@@ -1,13 +1,21 @@
 """Integration tests for task management API endpoints"""
 
 import pytest
-from datetime import date, datetime, timedelta
+from datetime import date, datetime
 from fastapi.testclient import TestClient
+from sqlalchemy import insert
 
 from src.api.main import app
-from src.db.models import TaskTemplate, TaskInstance
+from src.db.models import TaskTemplate, TaskInstance, TaskAuditLog
 from src.db.session import get_db
 
+# Dates relative to the frozen clock (2025-07-16 09:00, see conftest.py)
+TODAY = date(2025, 7, 16)
+NEXT_WEEK = date(2025, 7, 23)
+TODAY_10AM = datetime(2025, 7, 16, 10, 0)
+TODAY_2PM = datetime(2025, 7, 16, 14, 0)
+YESTERDAY_8AM = datetime(2025, 7, 15, 8, 0)
+
 
 class TestTaskAPI:
     """Integration tests for task API endpoints"""
@@ -17,55 +25,75 @@ class TestTaskAPI:
         """Set up test database"""
         self.db = test_db_session
 
-        # Create test data
-        self._create_test_data()
+    @pytest.fixture
+    def seed(self, test_db_session):
+        """Return a callable that inserts the test data, for tests that need it"""
+        return self._create_test_data
 
     def _create_test_data(self):
-        """Create test templates and instances"""
-        # Create templates
-        template1 = TaskTemplate(
-            id=1,
-            name="Daily Task",
-            rrule="RRULE:FREQ=DAILY",
-            is_blocking=False,
-            category="daily",
-            priority=1,
+        """Create test templates and instances in one executemany per table"""
+        self.db.execute(
+            insert(TaskTemplate),
+            [
+                {
+                    "id": 1,
+                    "name": "Daily Task",
+                    "rrule": "RRULE:FREQ=DAILY",
+                    "is_blocking": False,
+                    "category": "daily",
+                    "priority": 1,
+                },
+                {
+                    "id": 2,
+                    "name": "Weekly Blocking Task",
+                    "rrule": "RRULE:FREQ=WEEKLY;BYDAY=FR",
+                    "is_blocking": True,
+                    "category": "weekly",
+                    "priority": 1,
+                },
+            ],
         )
-        template2 = TaskTemplate(
-            id=2,
-            name="Weekly Blocking Task",
-            rrule="RRULE:FREQ=WEEKLY;BYDAY=FR",
-            is_blocking=True,
-            category="weekly",
-            priority=1,
+        self.db.execute(
+            insert(TaskInstance),
+            [
+                {
+                    "id": 1,
+                    "template_id": 1,
+                    "name": "Daily Task",
+                    "due_date": TODAY_10AM,
+                    "status": "pending",
+                    "is_blocking": False,
+                    "priority": 1,
+                },
+                {
+                    "id": 2,
+                    "template_id": 2,
+                    "name": "Weekly Blocking Task",
+                    "due_date": TODAY_2PM,
+                    "status": "pending",
+                    "is_blocking": True,
+                    "priority": 1,
+                },
+            ],
         )
+        self.db.commit()
 
-        # Create task instances
-        task1 = TaskInstance(
-            id=1,
-            template_id=1,
-            name="Daily Task",
-            due_date=datetime.now().replace(hour=10, minute=0),
-            status="pending",
-            is_blocking=False,
-            priority=1,
-        )
-        task2 = TaskInstance(
-            id=2,
-            template_id=2,
-            name="Weekly Blocking Task",
-            due_date=datetime.now().replace(hour=14, minute=0),
-            status="pending",
-            is_blocking=True,
-            priority=1,
-        )
+    def test_rollback_keeps_seeded_data(self, seed):
+        """Test that a rollback in code under test only discards its own changes"""
+        seed()
 
-        self.db.add_all([template1, template2, task1, task2])
-        self.db.commit()
+        self.db.add(TaskTemplate(name="Discarded Task", rrule="RRULE:FREQ=DAILY"))
+        self.db.flush()
+        self.db.rollback()
+
+        assert self.db.query(TaskTemplate).count() == 2
 
-    def test_get_pending_tasks(self, client: TestClient):
+    def test_get_pending_tasks(self, client: TestClient, seed, count_queries):
         """Test getting pending tasks"""
-        response = client.get("/api/tasks/")
+        seed()
+
+        with count_queries(max_queries=1):
+            response = client.get("/api/tasks/")
 
         assert response.status_code == 200
         data = response.json()
@@ -73,23 +101,27 @@ class TestTaskAPI:
         assert data[0]["status"] == "pending"
         assert data[1]["status"] == "pending"
 
-    def test_get_pending_tasks_with_filters(self, client: TestClient):
+    def test_get_pending_tasks_with_filters(self, client: TestClient, seed):
         """Test getting tasks with date filters"""
-        today = date.today().isoformat()
+        seed()
+
+        today = TODAY.isoformat()
         response = client.get(f"/api/tasks/?start_date={today}&end_date={today}")
 
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 2
 
-    def test_get_overdue_tasks(self, client: TestClient):
+    def test_get_overdue_tasks(self, client: TestClient, seed, count_queries):
         """Test getting overdue tasks"""
+        seed()
+
         # Create an overdue task
         overdue_task = TaskInstance(
             id=3,
             template_id=1,
             name="Overdue Task",
-            due_date=datetime.now().replace(hour=8) - timedelta(days=1),
+            due_date=YESTERDAY_8AM,
             status="pending",
             is_blocking=False,
             priority=1,
@@ -97,75 +129,144 @@ class TestTaskAPI:
         self.db.add(overdue_task)
         self.db.commit()
 
-        response = client.get("/api/tasks/overdue")
+        with count_queries(max_queries=1):
+            response = client.get("/api/tasks/overdue")
 
         assert response.status_code == 200
         data = response.json()
         assert len(data) >= 1
         assert any(task["name"] == "Overdue Task" for task in data)
 
-    def test_complete_task(self, client: TestClient):
-        """Test completing a task"""
+    @pytest.mark.parametrize(
+        "method,url,payload,expected_status,expected_fields",
+        [
+            (
+                "post",
+                "/api/tasks/1/complete",
+                {"notes": "Task completed successfully"},
+                200,
+                {
+                    "status": "completed",
+                    "notes": "Task completed successfully",
+                    "completed_at": "2025-07-16T09:00:00",
+                },
+            ),
+            (
+                "post",
+                "/api/tasks/1/skip",
+                {"reason": "Not applicable today"},
+                200,
+                {"status": "skipped", "notes": "Not applicable today"},
+            ),
+            (
+                "put",
+                "/api/tasks/1/status",
+                {"status": "in_progress"},
+                200,
+                {"status": "in_progress"},
+            ),
+            ("put", "/api/tasks/1/status", {"status": "invalid_status"}, 422, {}),
+        ],
+        ids=["complete", "skip", "update_status", "invalid_status"],
+    )
+    def test_change_task_status(
+        self, client: TestClient, seed, method, url, payload, expected_status, expected_fields
+    ):
+        """Test completing, skipping and updating the status of a task"""
+        seed()
+
+        response = client.request(method, url, json=payload)
+
+        assert response.status_code == expected_status
+        # Status-only cases (the 422) skip decoding the body
+        data = response.json() if expected_fields else {}
+        for field, value in expected_fields.items():
+            assert data[field] == value
+
+        # Verify in database
+        task = self.db.get(TaskInstance, 1)
+        assert task.status == expected_fields.get("status", "pending")
+
+    @pytest.mark.parametrize(
+        "method,url,payload",
+        [
+            ("post", "/api/tasks/999/complete", {}),
+            ("post", "/api/tasks/999/skip", {"reason": "Not applicable today"}),
+            ("put", "/api/tasks/999/status", {"status": "in_progress"}),
+        ],
+        ids=["complete", "skip", "update_status"],
+    )
+    def test_change_nonexistent_task_status(self, client: TestClient, method, url, payload):
+        """Test changing the status of a task that doesn't exist"""
+        response = client.request(method, url, json=payload)
+
+        assert response.status_code == 404
+        assert "not found" in response.json()["detail"]
+
+    def test_complete_tasks_batch(self, client: TestClient, seed):
+        """Test completing several tasks in one request"""
+        seed()
+
         response = client.post(
-            "/api/tasks/1/complete", json={"notes": "Task completed successfully"}
+            "/api/tasks/complete-batch", json={"ids": [1, 2], "notes": "Batch completed"}
         )
 
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "completed"
-        assert data["notes"] == "Task completed successfully"
+        assert [task["id"] for task in data] == [1, 2]
+        assert all(task["status"] == "completed" for task in data)
+        assert all(task["notes"] == "Batch completed" for task in data)
 
-        # Verify in database
-        task = self.db.query(TaskInstance).filter(TaskInstance.id == 1).first()
-        assert task.status == "completed"
-        assert task.completed_at is not None
+        audit_response = client.get("/api/tasks/2/audit")
+        assert audit_response.json()[0]["old_status"] == "pending"
+
+    def test_complete_tasks_batch_nonexistent_task(self, client: TestClient, seed):
+        """Test that a batch containing an unknown task completes nothing"""
+        seed()
 
-    def test_complete_nonexistent_task(self, client: TestClient):
-        """Test completing a task that doesn't exist"""
-        response = client.post("/api/tasks/999/complete", json={})
+        response = client.post("/api/tasks/complete-batch", json={"ids": [1, 999]})
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"]
 
-    def test_skip_task(self, client: TestClient):
-        """Test skipping a task"""
-        response = client.post("/api/tasks/1/skip", json={"reason": "Not applicable today"})
+        task = self.db.get(TaskInstance, 1)
+        assert task.status == "pending"
 
-        assert response.status_code == 200
-        data = response.json()
-        assert data["status"] == "skipped"
-        assert data["notes"] == "Not applicable today"
+    def test_get_compliance_metrics(self, client: TestClient, seed, count_queries):
+        """Test getting compliance metrics"""
+        seed()
 
-    def test_update_task_status(self, client: TestClient):
-        """Test updating task status"""
-        response = client.put("/api/tasks/1/status", json={"status": "in_progress"})
+        start_date = TODAY.isoformat()
+        end_date = TODAY.isoformat()
+
+        # One aggregate query for the metrics plus one for the blocking status
+        with count_queries(max_queries=2):
+            response = client.get(
+                f"/api/tasks/compliance?start_date={start_date}&end_date={end_date}"
+            )
 
         assert response.status_code == 200
         data = response.json()
-        assert data["status"] == "in_progress"
-
-    def test_update_task_invalid_status(self, client: TestClient):
-        """Test updating task with invalid status"""
-        response = client.put("/api/tasks/1/status", json={"status": "invalid_status"})
-
-        assert response.status_code == 422  # Validation error
+        assert data["total_tasks"] == 2
+        assert data["completed_tasks"] == 0
+        assert data["overdue_tasks"] == 0
+        assert data["compliance_rate"] == 0.0
+        assert data["blocking_tasks_complete"] is False
 
-    def test_get_compliance_metrics(self, client: TestClient):
-        """Test getting compliance metrics"""
-        start_date = date.today().isoformat()
-        end_date = date.today().isoformat()
-
-        response = client.get(f"/api/tasks/compliance?start_date={start_date}&end_date={end_date}")
+    def test_get_compliance_metrics_empty_range(self, client: TestClient):
+        """Test compliance metrics for a range with no tasks"""
+        response = client.get("/api/tasks/compliance?start_date=2025-01-01&end_date=2025-01-01")
 
         assert response.status_code == 200
         data = response.json()
-        assert "total_tasks" in data
-        assert "completed_tasks" in data
-        assert "compliance_rate" in data
-        assert "blocking_tasks_complete" in data
+        assert data["total_tasks"] == 0
+        assert data["skipped_tasks"] == 0
+        assert data["daily_compliance_rate"] == 0.0
 
-    def test_get_blocking_status(self, client: TestClient):
+    def test_get_blocking_status(self, client: TestClient, seed):
         """Test getting blocking tasks status"""
+        seed()
+
         response = client.get("/api/tasks/blocking-status")
 
         assert response.status_code == 200
@@ -175,9 +276,12 @@ class TestTaskAPI:
         assert "total_blocking" in data
         assert data["total_blocking"] >= 1  # We have at least one blocking task
 
-    def test_get_weekly_readiness(self, client: TestClient):
+    def test_get_weekly_readiness(self, client: TestClient, seed, count_queries):
         """Test checking weekly readiness"""
-        response = client.get("/api/tasks/weekly-readiness")
+        seed()
+
+        with count_queries(max_queries=1):
+            response = client.get("/api/tasks/weekly-readiness")
 
         assert response.status_code == 200
         data = response.json()
@@ -185,6 +289,21 @@ class TestTaskAPI:
         assert "blocking_tasks" in data
         assert "message" in data
 
+    def test_get_task_dashboard(self, client: TestClient, seed, count_queries):
+        """Test getting pending tasks with blocking status and readiness in one query"""
+        seed()
+
+        with count_queries(max_queries=1):
+            response = client.get("/api/tasks/dashboard")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [task["id"] for task in data["tasks"]] == [1, 2]
+        assert data["blocking_status"]["total_blocking"] == 1
+        assert data["blocking_status"]["all_complete"] is False
+        assert data["readiness"]["is_ready"] is False
+        assert data["readiness"]["blocking_tasks"][0]["id"] == 2
+
     def test_create_task_template(self, client: TestClient):
         """Test creating a new task template"""
         template_data = {
@@ -213,8 +332,10 @@ class TestTaskAPI:
         assert response.status_code == 400
         assert "Invalid RRULE" in response.json()["detail"]
 
-    def test_get_task_templates(self, client: TestClient):
+    def test_get_task_templates(self, client: TestClient, seed):
         """Test getting task templates"""
+        seed()
+
         response = client.get("/api/tasks/templates")
 
         assert response.status_code == 200
@@ -222,8 +343,10 @@ class TestTaskAPI:
         assert len(data) == 2
         assert all(template["is_active"] for template in data)
 
-    def test_update_task_template(self, client: TestClient):
+    def test_update_task_template(self, client: TestClient, seed):
         """Test updating a task template"""
+        seed()
+
         update_data = {"name": "Updated Task Name", "priority": 3}
 
         response = client.put("/api/tasks/templates/1", json=update_data)
@@ -233,21 +356,23 @@ class TestTaskAPI:
         assert data["name"] == "Updated Task Name"
         assert data["priority"] == 3
 
-    def test_delete_task_template(self, client: TestClient):
+    def test_delete_task_template(self, client: TestClient, seed):
         """Test deleting (soft delete) a task template"""
+        seed()
+
         response = client.delete("/api/tasks/templates/1")
 
         assert response.status_code == 200
         assert "deleted successfully" in response.json()["message"]
 
         # Verify it's soft deleted
-        template = self.db.query(TaskTemplate).filter(TaskTemplate.id == 1).first()
+        template = self.db.get(TaskTemplate, 1)
         assert template.is_active is False
 
     def test_generate_task_instances(self, client: TestClient):
         """Test generating task instances"""
-        start_date = date.today().isoformat()
-        end_date = (date.today() + timedelta(days=7)).isoformat()
+        start_date = TODAY.isoformat()
+        end_date = NEXT_WEEK.isoformat()
 
         response = client.post(f"/api/tasks/generate?start_date={start_date}&end_date={end_date}")
 
@@ -256,14 +381,30 @@ class TestTaskAPI:
         assert "count" in data
         assert data["count"] >= 0
 
-    def test_get_task_audit_log(self, client: TestClient):
+    def test_get_task_audit_log(self, client: TestClient, seed):
         """Test getting audit log for a task"""
-        # First complete a task to create audit entry
-        client.post("/api/tasks/1/complete", json={"notes": "Done"})
+        seed()
+
+        # Insert the audit entry directly; completion writing it is covered elsewhere
+        self.db.execute(
+            insert(TaskAuditLog),
+            [
+                {
+                    "task_instance_id": 1,
+                    "action": "completed",
+                    "old_status": "pending",
+                    "new_status": "completed",
+                    "user_id": "test_user",
+                    "notes": "Done",
+                }
+            ],
+        )
+        self.db.commit()
 
         response = client.get("/api/tasks/1/audit")
 
         assert response.status_code == 200
         data = response.json()
-        assert len(data) >= 1
+        assert len(data) == 1
         assert data[0]["action"] == "completed"
+        assert data[0]["notes"] == "Done"
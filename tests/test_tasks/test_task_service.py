@@ -1,36 +1,36 @@
 """Unit tests for TaskService"""
 
 import pytest
-from datetime import date, datetime, timedelta
-from unittest.mock import Mock, AsyncMock
-from sqlalchemy.orm import Session
+from datetime import date, datetime
+from unittest.mock import patch
 
 from src.services.tasks.task_service import TaskService
-from src.db.models import TaskTemplate, TaskInstance
+from src.db.models import TaskTemplate, TaskInstance, TaskAuditLog
+
+# Dates relative to the frozen clock (2025-07-16 09:00, see conftest.py)
+YESTERDAY_10AM = datetime(2025, 7, 15, 10, 0)
+TODAY_10AM = datetime(2025, 7, 16, 10, 0)
+TOMORROW_10AM = datetime(2025, 7, 17, 10, 0)
 
 
 @pytest.mark.asyncio
 class TestTaskService:
-    """Test cases for TaskService"""
+    """Test cases for TaskService against the shared SQLite test database"""
+
+    @pytest.fixture(autouse=True)
+    def setup_db(self, test_db_session, task_service):
+        """Run each test in the rolled-back test_db_session transaction"""
+        self.db = test_db_session
+        self.service = task_service
 
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.service = TaskService()
-        self.mock_db = Mock(spec=Session)
+    async def test_services_share_rrule_parser(self):
+        """Test that TaskService instances reuse the module-level RRULE parser"""
+        assert TaskService().rrule_parser is TaskService().rrule_parser
 
     async def test_create_task_template_valid(self):
         """Test creating a valid task template"""
-        # Mock the RRULE validation
-        self.service.rrule_parser.validate_rrule = Mock()
-        self.service.rrule_parser.validate_rrule.return_value.is_valid = True
-
-        # Mock database operations
-        self.mock_db.add = Mock()
-        self.mock_db.commit = Mock()
-        self.mock_db.refresh = Mock()
-
-        await self.service.create_task_template(
-            self.mock_db,
+        template = await self.service.create_task_template(
+            self.db,
             name="Test Task",
             rrule="RRULE:FREQ=DAILY",
             description="Test description",
@@ -40,264 +40,228 @@ class TestTaskService:
             estimated_duration=30,
         )
 
-        self.mock_db.add.assert_called_once()
-        self.mock_db.commit.assert_called_once()
-        self.mock_db.refresh.assert_called_once()
+        assert template.id is not None
+        assert template.is_active is True
+        assert self.db.get(TaskTemplate, template.id).name == "Test Task"
 
     async def test_create_task_template_invalid_rrule(self):
         """Test creating task template with invalid RRULE"""
-        # Mock invalid RRULE validation
-        self.service.rrule_parser.validate_rrule = Mock()
-        validate_result = self.service.rrule_parser.validate_rrule.return_value
-        validate_result.is_valid = False
-        validate_result.error_message = "Invalid syntax"
-
         with pytest.raises(ValueError, match="Invalid RRULE"):
             await self.service.create_task_template(
-                self.mock_db, name="Test Task", rrule="INVALID_RRULE"
+                self.db, name="Test Task", rrule="INVALID_RRULE"
             )
 
+        assert self.db.query(TaskTemplate).count() == 0
+
     async def test_update_task_template(self):
         """Test updating an existing task template"""
-        # Mock existing template
-        mock_template = Mock(spec=TaskTemplate)
-        mock_template.id = 1
-        mock_template.name = "Old Name"
-
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = mock_template
-        self.mock_db.commit = Mock()
-        self.mock_db.refresh = Mock()
-
-        # Mock RRULE validation for update
-        self.service.rrule_parser.validate_rrule = Mock()
-        self.service.rrule_parser.validate_rrule.return_value.is_valid = True
+        template = self._add_template(name="Old Name")
 
         await self.service.update_task_template(
-            self.mock_db, template_id=1, name="New Name", rrule="RRULE:FREQ=WEEKLY"
+            self.db, template_id=template.id, name="New Name", rrule="RRULE:FREQ=WEEKLY"
         )
 
-        assert mock_template.name == "New Name"
-        assert mock_template.rrule == "RRULE:FREQ=WEEKLY"
-        self.mock_db.commit.assert_called_once()
-
-    async def test_update_task_template_not_found(self):
-        """Test updating non-existent task template"""
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = None
-
-        with pytest.raises(ValueError, match="Task template 999 not found"):
-            await self.service.update_task_template(self.mock_db, template_id=999)
-
-    async def test_delete_task_template(self):
-        """Test soft deleting a task template"""
-        mock_template = Mock(spec=TaskTemplate)
-        mock_template.is_active = True
-
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = mock_template
-        self.mock_db.commit = Mock()
-
-        result = await self.service.delete_task_template(self.mock_db, template_id=1)
-
-        assert result is True
-        assert mock_template.is_active is False
-        self.mock_db.commit.assert_called_once()
-
-    async def test_delete_task_template_not_found(self):
-        """Test deleting non-existent task template"""
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = None
-
-        result = await self.service.delete_task_template(self.mock_db, template_id=999)
-
-        assert result is False
+        assert template.name == "New Name"
+        assert template.rrule == "RRULE:FREQ=WEEKLY"
+
+    @pytest.mark.parametrize(
+        "exists,expected", [(True, True), (False, False)], ids=["found", "not_found"]
+    )
+    async def test_delete_task_template(self, exists, expected):
+        """Test soft deleting a task template, and deleting one that doesn't exist"""
+        template = self._add_template() if exists else None
+        template_id = template.id if template else 999
+
+        result = await self.service.delete_task_template(self.db, template_id=template_id)
+
+        assert result is expected
+        if template:
+            assert template.is_active is False
+
+    @pytest.mark.parametrize(
+        "method,kwargs,message",
+        [
+            ("update_task_template", {"template_id": 999}, "Task template 999 not found"),
+            ("complete_task", {"task_id": 999, "user_id": "test"}, "Task 999 not found"),
+            (
+                "skip_task",
+                {"task_id": 999, "user_id": "test", "reason": "Not applicable"},
+                "Task 999 not found",
+            ),
+        ],
+        ids=["update_template", "complete", "skip"],
+    )
+    async def test_missing_record_raises(self, method, kwargs, message):
+        """Test that operations on a non-existent template or task raise ValueError"""
+        with pytest.raises(ValueError, match=message):
+            await getattr(self.service, method)(self.db, **kwargs)
 
     async def test_get_task_templates_active_only(self):
         """Test getting active task templates"""
-        mock_templates = [Mock(spec=TaskTemplate), Mock(spec=TaskTemplate)]
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.all.return_value = mock_templates
+        self._add_template(name="Active 1")
+        self._add_template(name="Active 2")
+        self._add_template(name="Retired", is_active=False)
 
-        templates = await self.service.get_task_templates(self.mock_db, active_only=True)
+        templates = await self.service.get_task_templates(self.db, active_only=True)
 
-        assert len(templates) == 2
-        # Verify filter was called for active templates
-        self.mock_db.query.return_value.filter.assert_called_once()
+        assert sorted(t.name for t in templates) == ["Active 1", "Active 2"]
 
-    async def test_generate_task_instances(self):
+    async def test_generate_task_instances(self, count_queries):
         """Test generating task instances from templates"""
-        # Mock active templates
-        mock_template = Mock(spec=TaskTemplate)
-        mock_template.id = 1
-        mock_template.name = "Daily Task"
-        mock_template.rrule = "RRULE:FREQ=DAILY"
-        mock_template.is_blocking = False
-        mock_template.priority = 1
-        mock_template.description = "Test"
-
-        self.service.get_task_templates = AsyncMock(return_value=[mock_template])
-
-        # Mock RRULE occurrences
-        mock_occurrences = [datetime(2025, 7, 16, 10, 0), datetime(2025, 7, 17, 10, 0)]
-        self.service.rrule_parser.generate_occurrences = Mock(return_value=mock_occurrences)
-
-        # Mock existing task check
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = None
-        self.mock_db.add = Mock()
-        self.mock_db.commit = Mock()
-
-        instances = await self.service.generate_task_instances(
-            self.mock_db, date(2025, 7, 16), date(2025, 7, 17)
+        template = self._add_template(
+            name="Daily Task", rrule="RRULE:FREQ=DAILY;BYHOUR=10", description="Test"
         )
 
-        assert len(instances) == 2
-        assert self.mock_db.add.call_count == 2
-        self.mock_db.commit.assert_called_once()
+        # Templates, existing instances, then one batched INSERT
+        with count_queries(max_queries=3):
+            instances = await self.service.generate_task_instances(
+                self.db, date(2025, 7, 16), date(2025, 7, 17)
+            )
 
-    async def test_generate_task_instances_skip_existing(self):
-        """Test that existing task instances are not duplicated"""
-        mock_template = Mock(spec=TaskTemplate)
-        mock_template.id = 1
-        mock_template.rrule = "RRULE:FREQ=DAILY"
+        assert [i.due_date for i in instances] == [TODAY_10AM, TOMORROW_10AM]
+        assert all(i.template_id == template.id for i in instances)
+        assert self.db.query(TaskInstance).count() == 2
+
+    async def test_generate_task_instances_accepts_iterator(self):
+        """Test that occurrences are consumed in a single pass, as a lazy rrule yields them"""
+        self._add_template(name="Daily Task")
+
+        with patch.object(
+            self.service.rrule_parser,
+            "generate_occurrences",
+            side_effect=lambda *args: iter([TODAY_10AM, TOMORROW_10AM]),
+        ):
+            instances = await self.service.generate_task_instances(
+                self.db, date(2025, 7, 16), date(2025, 7, 17)
+            )
 
-        self.service.get_task_templates = AsyncMock(return_value=[mock_template])
-        self.service.rrule_parser.generate_occurrences = Mock(
-            return_value=[datetime(2025, 7, 16, 10, 0)]
-        )
+        assert [i.due_date for i in instances] == [TODAY_10AM, TOMORROW_10AM]
 
-        # Mock existing task
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = Mock()
+    async def test_generate_task_instances_skip_existing(self):
+        """Test that existing task instances are not duplicated"""
+        self._add_template(rrule="RRULE:FREQ=DAILY;BYHOUR=10")
+        await self.service.generate_task_instances(self.db, date(2025, 7, 16), date(2025, 7, 16))
 
         instances = await self.service.generate_task_instances(
-            self.mock_db, date(2025, 7, 16), date(2025, 7, 16)
+            self.db, date(2025, 7, 16), date(2025, 7, 16)
         )
 
         assert len(instances) == 0  # No new instances created
-        self.mock_db.add.assert_not_called()
-
-    async def test_get_pending_tasks(self):
-        """Test getting pending tasks"""
-        mock_tasks = [
-            self._create_mock_task(1, "Task 1", "pending"),
-            self._create_mock_task(2, "Task 2", "in_progress"),
-        ]
-
-        query_mock = Mock()
-        filter_result = query_mock.filter.return_value.order_by.return_value
-        filter_result.all.return_value = mock_tasks
-        self.mock_db.query.return_value = query_mock
-
-        tasks = await self.service.get_pending_tasks(self.mock_db)
-
-        assert len(tasks) == 2
-        query_mock.filter.assert_called_once()
-        query_mock.filter.return_value.order_by.assert_called_once()
-
-    async def test_get_overdue_tasks(self):
-        """Test getting overdue tasks"""
-        mock_tasks = [self._create_mock_task(1, "Overdue Task", "pending")]
-
-        query_mock = Mock()
-        filter_result = query_mock.filter.return_value.order_by.return_value
-        filter_result.all.return_value = mock_tasks
-        self.mock_db.query.return_value = query_mock
-
-        tasks = await self.service.get_overdue_tasks(self.mock_db)
-
-        assert len(tasks) == 1
-        # Verify filter was called with overdue criteria
-        query_mock.filter.assert_called_once()
+        assert self.db.query(TaskInstance).count() == 1
+
+    @pytest.mark.parametrize(
+        "method,expected",
+        [
+            ("get_pending_tasks", ["Overdue Task", "Task 1", "Task 2"]),
+            ("get_overdue_tasks", ["Overdue Task"]),
+        ],
+        ids=["pending", "overdue"],
+    )
+    async def test_get_open_tasks(self, method, expected):
+        """Test getting pending and overdue tasks, ordered by due date"""
+        self._add_task("Task 2", "in_progress", due_date=TOMORROW_10AM)
+        self._add_task("Task 1", "pending")
+        self._add_task("Overdue Task", "pending", due_date=YESTERDAY_10AM)
+        self._add_task("Done", "completed")
+        self._add_task("Done Late", "completed", due_date=YESTERDAY_10AM)
+
+        tasks = await getattr(self.service, method)(self.db)
+
+        assert [t.name for t in tasks] == expected
 
     async def test_complete_task(self):
         """Test completing a task"""
-        mock_task = self._create_mock_task(1, "Test Task", "pending")
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = mock_task
-        self.mock_db.add = Mock()
-        self.mock_db.commit = Mock()
-        self.mock_db.refresh = Mock()
+        task = self._add_task("Test Task", "pending")
 
         await self.service.complete_task(
-            self.mock_db, task_id=1, user_id="test_user", notes="Completed successfully"
+            self.db, task_id=task.id, user_id="test_user", notes="Completed successfully"
         )
 
-        assert mock_task.status == "completed"
-        assert mock_task.completed_by == "test_user"
-        assert mock_task.notes == "Completed successfully"
-        assert mock_task.completed_at is not None
-        self.mock_db.add.assert_called_once()  # Audit log added
-        self.mock_db.commit.assert_called_once()
-
-    async def test_complete_task_not_found(self):
-        """Test completing non-existent task"""
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = None
-
-        with pytest.raises(ValueError, match="Task 999 not found"):
-            await self.service.complete_task(self.mock_db, task_id=999, user_id="test")
+        assert task.status == "completed"
+        assert task.completed_by == "test_user"
+        assert task.notes == "Completed successfully"
+        assert task.completed_at == datetime(2025, 7, 16, 9, 0)
+        audit = self.db.query(TaskAuditLog).filter_by(task_instance_id=task.id).one()
+        assert (audit.action, audit.old_status) == ("completed", "pending")
 
     async def test_skip_task(self):
         """Test skipping a task"""
-        mock_task = self._create_mock_task(1, "Test Task", "pending")
-        query_result = self.mock_db.query.return_value.filter.return_value
-        query_result.first.return_value = mock_task
-        self.mock_db.add = Mock()
-        self.mock_db.commit = Mock()
-        self.mock_db.refresh = Mock()
+        task = self._add_task("Test Task", "pending")
 
         await self.service.skip_task(
-            self.mock_db, task_id=1, user_id="test_user", reason="Not applicable today"
+            self.db, task_id=task.id, user_id="test_user", reason="Not applicable today"
         )
 
-        assert mock_task.status == "skipped"
-        assert mock_task.notes == "Not applicable today"
-        self.mock_db.add.assert_called_once()  # Audit log added
-        self.mock_db.commit.assert_called_once()
-
-    async def test_get_compliance_metrics(self):
+        assert task.status == "skipped"
+        assert task.notes == "Not applicable today"
+        audit = self.db.query(TaskAuditLog).filter_by(task_instance_id=task.id).one()
+        assert audit.action == "skipped"
+
+    @pytest.mark.parametrize(
+        "tasks,expected",
+        [
+            (
+                [
+                    ("completed", False, TODAY_10AM),
+                    ("skipped", False, TODAY_10AM),
+                    ("pending", True, YESTERDAY_10AM),
+                    ("completed", True, TODAY_10AM),
+                ],
+                {
+                    "total_tasks": 4,
+                    "completed_tasks": 2,
+                    "skipped_tasks": 1,
+                    "overdue_tasks": 1,
+                    "compliance_rate": 75.0,  # 3 out of 4 completed/skipped
+                    "daily_compliance_rate": 100.0,  # Both daily tasks done
+                    "weekly_compliance_rate": 50.0,  # 1 of 2 weekly done
+                    "blocking_tasks_complete": False,
+                },
+            ),
+            (
+                [("completed", True, TODAY_10AM), ("skipped", True, TOMORROW_10AM)],
+                {
+                    "total_tasks": 2,
+                    "completed_tasks": 1,
+                    "skipped_tasks": 1,
+                    "overdue_tasks": 0,
+                    "compliance_rate": 100.0,
+                    "daily_compliance_rate": 0.0,  # No daily tasks in range
+                    "weekly_compliance_rate": 100.0,
+                    "blocking_tasks_complete": True,
+                },
+            ),
+        ],
+        ids=["mixed", "blocking_only"],
+    )
+    async def test_get_compliance_metrics(self, tasks, expected):
         """Test getting compliance metrics"""
-        # Mock tasks
-        mock_tasks = [
-            self._create_mock_task(1, "Task 1", "completed", is_blocking=False),
-            self._create_mock_task(2, "Task 2", "skipped", is_blocking=False),
-            self._create_mock_task(3, "Task 3", "pending", is_blocking=True),
-            self._create_mock_task(4, "Task 4", "completed", is_blocking=True),
-        ]
-
-        # Set overdue for task 3
-        mock_tasks[2].due_date = datetime.now() - timedelta(days=1)
-
-        query_all_result = self.mock_db.query.return_value.filter.return_value.all
-        query_all_result.return_value = mock_tasks
-
-        # Mock blocking status check
-        self.service.compliance_checker.check_blocking_tasks_complete = AsyncMock()
-        check_result = self.service.compliance_checker.check_blocking_tasks_complete.return_value
-        check_result.all_complete = False
+        for i, (status, is_blocking, due_date) in enumerate(tasks, start=1):
+            self._add_task(f"Task {i}", status, is_blocking=is_blocking, due_date=due_date)
 
         metrics = await self.service.get_compliance_metrics(
-            self.mock_db, date(2025, 7, 14), date(2025, 7, 20)
+            self.db, date(2025, 7, 14), date(2025, 7, 20)
         )
 
-        assert metrics.total_tasks == 4
-        assert metrics.completed_tasks == 2
-        assert metrics.skipped_tasks == 1
-        assert metrics.overdue_tasks == 1
-        assert metrics.compliance_rate == 75.0  # 3 out of 4 completed/skipped
-        assert metrics.daily_compliance_rate == 100.0  # Both daily tasks done
-        assert metrics.weekly_compliance_rate == 50.0  # 1 of 2 weekly done
-        assert metrics.blocking_tasks_complete is False
-
-    def _create_mock_task(self, task_id, name, status, is_blocking=False):
-        """Helper to create a mock TaskInstance"""
-        task = Mock(spec=TaskInstance)
-        task.id = task_id
-        task.name = name
-        task.status = status
-        task.is_blocking = is_blocking
-        task.due_date = datetime.now()
-        task.completed_at = datetime.now() if status == "completed" else None
+        assert {field: getattr(metrics, field) for field in expected} == expected
+
+    def _add_template(self, name="Template", rrule="RRULE:FREQ=DAILY", **fields):
+        """Helper to persist a TaskTemplate"""
+        template = TaskTemplate(name=name, rrule=rrule, **fields)
+        self.db.add(template)
+        self.db.flush()
+        return template
+
+    def _add_task(self, name, status, is_blocking=False, due_date=TODAY_10AM):
+        """Helper to persist a TaskInstance under a fresh template"""
+        template = self._add_template(name=name, is_blocking=is_blocking)
+        task = TaskInstance(
+            template_id=template.id,
+            name=name,
+            status=status,
+            is_blocking=is_blocking,
+            due_date=due_date,
+        )
+        self.db.add(task)
+        self.db.flush()
         return task
@@ -1,51 +1,106 @@
 #!/usr/bin/env python3
 """Verify SnapTrade fix by testing API endpoints directly"""
 
+import asyncio
+import httpx
 import requests
 import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 # Test with a known working user
 BASE_URL = "http://localhost:8002"
+TIMEOUT = 5  # seconds per request
+
+
+def build_session() -> requests.Session:
+    """Create the pooled session used for the login that the probes depend on
+
+    Transient gateway errors are retried so a server that is still starting up
+    does not fail the whole run; the only POST here is the login, which is safe
+    to repeat.
+    """
+    session = requests.Session()
+    session.mount(
+        "http://",
+        HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=["GET", "POST"],
+            ),
+        ),
+    )
+    return session
+
+
+async def probe_snaptrade(token: str) -> tuple[httpx.Response, httpx.Response]:
+    """Hit the registration and connection URL endpoints concurrently"""
+    async with httpx.AsyncClient(
+        base_url=BASE_URL, headers={"Authorization": f"Bearer {token}"}, timeout=TIMEOUT
+    ) as client:
+        return await asyncio.gather(
+            client.post("/api/snaptrade/register", json={}),
+            client.get("/api/snaptrade/connect"),
+        )
+
+
+def main() -> int:
+    """Run the login and SnapTrade probes; return the process exit code"""
+    session = build_session()
+
+    # Warm up a freshly started server and the pooled connection so the login
+    # below is not skewed by cold-start cost
+    session.get(f"{BASE_URL}/api/health", timeout=TIMEOUT)
+
+    # Login with test user
+    print("1️⃣ Testing login...")
+    login_response = session.post(
+        f"{BASE_URL}/api/auth/login",
+        json={"email": "test@aims.local", "password": "password123"},
+        timeout=TIMEOUT,
+    )
+
+    if login_response.status_code != 200:
+        print(f"❌ Login failed: {login_response.status_code}")
+        print(f"Response: {login_response.text}")
+        return 1
+
+    token = login_response.json()["access_token"]
+    print("✅ Login successful")
+
+    # The two probes only depend on the login, so issue them together
+    register_response, connect_response = asyncio.run(probe_snaptrade(token))
+
+    # Test SnapTrade registration endpoint
+    print("\n2️⃣ Testing SnapTrade registration...")
+    print(f"Status: {register_response.status_code}")
+    register_data = register_response.json()
+    print(f"Response: {register_data}")
+
+    if register_response.status_code == 200 and register_data.get("status") == "already_registered":
+        print("✅ User already registered with SnapTrade")
+    else:
+        print("❌ Unexpected registration response")
+
+    # Test SnapTrade connection URL endpoint (THE KEY TEST)
+    print("\n3️⃣ Testing SnapTrade connection URL...")
+    print(f"Status: {connect_response.status_code}")
+    connect_data = connect_response.json()
+
+    if connect_response.status_code == 200:
+        print("✅ Connection URL retrieved successfully!")
+        print(f"URL: {connect_data.get('connection_url', 'N/A')[:50]}...")
+        print("\n🎉 FIX VERIFIED - SnapTrade integration is working!")
+        return 0
 
-# Login with test user
-print("1️⃣ Testing login...")
-login_response = requests.post(
-    f"{BASE_URL}/api/auth/login", json={"email": "test@aims.local", "password": "password123"}
-)
-
-if login_response.status_code != 200:
-    print(f"❌ Login failed: {login_response.status_code}")
-    print(f"Response: {login_response.text}")
-    sys.exit(1)
-
-token = login_response.json()["access_token"]
-print("✅ Login successful")
-
-# Test SnapTrade registration endpoint
-print("\n2️⃣ Testing SnapTrade registration...")
-headers = {"Authorization": f"Bearer {token}"}
-register_response = requests.post(f"{BASE_URL}/api/snaptrade/register", headers=headers, json={})
-
-print(f"Status: {register_response.status_code}")
-register_data = register_response.json()
-print(f"Response: {register_data}")
-
-if register_response.status_code == 200 and register_data.get("status") == "already_registered":
-    print("✅ User already registered with SnapTrade")
-else:
-    print("❌ Unexpected registration response")
-
-# Test SnapTrade connection URL endpoint (THE KEY TEST)
-print("\n3️⃣ Testing SnapTrade connection URL...")
-connect_response = requests.get(f"{BASE_URL}/api/snaptrade/connect", headers=headers)
-
-print(f"Status: {connect_response.status_code}")
-connect_data = connect_response.json()
-
-if connect_response.status_code == 200:
-    print("✅ Connection URL retrieved successfully!")
-    print(f"URL: {connect_data.get('connection_url', 'N/A')[:50]}...")
-    print("\n🎉 FIX VERIFIED - SnapTrade integration is working!")
-else:
     print(f"❌ Failed to get connection URL: {connect_data}")
     print("\n❌ FIX NOT WORKING - Still have issues")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())